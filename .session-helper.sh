@@ -4,36 +4,27 @@
 _c1(){ 
     local _cache=".aidefense/.cache"
     if [ -f "$_cache" ]; then
-        local _token
-        _token=$(python3 - <<'PY'
+        # Read and decode the cached token in a single interpreter start
+        local _decoded
+        _decoded=$(python3 - <<'PY'
+import base64
+import os
 from pathlib import Path
 
-cache_path = Path(".aidefense/.cache")
-for line in cache_path.read_text(encoding="utf-8").splitlines():
+# An empty DEVENV_USER falls back too, matching session_cache.py
+env_key = (os.environ.get("DEVENV_USER") or "default-key-fallback").encode()
+for line in Path(".aidefense/.cache").read_text(encoding="utf-8").splitlines():
     if line.startswith("session_token="):
-        print(line.split("=", 1)[1].strip())
+        data = base64.b64decode(line.split("=", 1)[1].strip())
+        key_rep = (env_key * (len(data) // len(env_key) + 1))[:len(data)]
+        print(bytes(a ^ b for a, b in zip(data, key_rep)).decode("utf-8"))
         break
 PY
 )
 
-        if [ -n "$_token" ]; then
-            local _decoded
-            _decoded=$(python3 <<PY
-import base64
-import os
-
-token = """$_token"""
-env_key = os.environ.get("DEVENV_USER", "default-key-fallback").encode()
-data = base64.b64decode(token)
-key_rep = (env_key * (len(data) // len(env_key) + 1))[:len(data)]
-print(bytes(a ^ b for a, b in zip(data, key_rep)).decode("utf-8"))
-PY
-)
-
-            if [ -n "$_decoded" ]; then
-                IFS=':' read -r SESSION_K1 SESSION_K2 SESSION_K3 SESSION_K4 SESSION_K5 <<< "$_decoded"
-                return 0
-            fi
+        if [ -n "$_decoded" ]; then
+            IFS=':' read -r SESSION_K1 SESSION_K2 SESSION_K3 SESSION_K4 SESSION_K5 <<< "$_decoded"
+            return 0
         fi
     fi
 
@@ -58,7 +49,9 @@ _c2(){
     local _v1="YWlkZWZlbnNl"  # 'aidefense' base64 encoded
     local _v2="${LAB_PASSWORD}"
     
-    local _r=$(curl -s "$_u" \
+    # Retry transient failures (timeouts, 429/5xx) before falling back to the
+    # cache; the payload is a handful of keys, so refuse anything oversized
+    local _r=$(curl -s --connect-timeout 5 --max-time 20 --retry 2 --max-filesize 65536 "$_u" \
         -H "$(echo "$_h1"|base64 -d): $(echo "$_v1"|base64 -d)" \
         -H "$(echo "$_h2"|base64 -d): $_v2" 2>/dev/null)
     
@@ -68,12 +61,20 @@ _c2(){
     
     # Parse response - keep the legacy five-field payload shape so
     # existing cache readers keep working. Field 2 is now used as a
-    # compatibility token for the prebuilt gateway connection.
-    SESSION_K1=$(echo "$_r"|python3 -c "import sys,json;d=json.load(sys.stdin);print(d.get('AIDEFENSE_API_KEY',''))" 2>/dev/null)
-    SESSION_K2=$(echo "$_r"|python3 -c "import sys,json;d=json.load(sys.stdin);print(d.get('MISTRAL_API_KEY',''))" 2>/dev/null)
-    SESSION_K3=$(echo "$_r"|python3 -c "import sys,json;d=json.load(sys.stdin);print(d.get('CONNECTION_ID',''))" 2>/dev/null)
-    SESSION_K4=$(echo "$_r"|python3 -c "import sys,json;d=json.load(sys.stdin);print(d.get('GATEWAY_AUTH_TOKEN',''))" 2>/dev/null)
-    SESSION_K5=$(echo "$_r"|python3 -c "import sys,json;d=json.load(sys.stdin);print(d.get('AIDEFENSE_MGMT_API',''))" 2>/dev/null)
+    # compatibility token for the prebuilt gateway connection. All five
+    # fields come out of one JSON parse, one per line.
+    local _fields=() _line
+    while IFS= read -r _line; do
+        _fields+=("$_line")
+    done < <(printf '%s' "$_r"|python3 -c "import sys,json
+d=json.load(sys.stdin)
+for k in ('AIDEFENSE_API_KEY','MISTRAL_API_KEY','CONNECTION_ID','GATEWAY_AUTH_TOKEN','AIDEFENSE_MGMT_API'):
+    print(d.get(k,''))" 2>/dev/null)
+    SESSION_K1="${_fields[0]:-}"
+    SESSION_K2="${_fields[1]:-}"
+    SESSION_K3="${_fields[2]:-}"
+    SESSION_K4="${_fields[3]:-}"
+    SESSION_K5="${_fields[4]:-}"
     
     if [ -z "$SESSION_K1" ] || [ -z "$SESSION_K3" ] || [ -z "$SESSION_K5" ]; then
         return 1
@@ -3,46 +3,62 @@
 AI agent with database access and AI Defense integration.
 """
 
+import re
 import sys
+import functools
 import select
 import sqlite3
-import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, Any
 
+from http_pool import dumps_json, get_http_session, loads_json
 from session_cache import get_lab_llm_api_key, get_lab_llm_base_url, get_lab_llm_model, get_primary_key
 
+_WORD_PATTERN = re.compile(r"[a-z]+")
+# Words that get the canned joke when the lab LLM is unavailable
+_JOKE_WORDS = frozenset({"joke", "jokes"})
+
+_ACTION_MESSAGES = {
+    'block': '🚫 Response BLOCKED by security policy',
+    'warn': '⚠️  Response ALLOWED with warning',
+    'log': '📝 Response LOGGED for audit'
+}
+
 class SimpleConversationMemory:
     """Small in-process chat history buffer for the lab demo."""
 
     def __init__(self, window_size: int = 5):
         self.window_size = window_size
-        self.messages = []
-
-    def add_user_message(self, message: str):
-        self.messages.append({"role": "user", "content": message})
-        self._trim()
+        self.exchanges = deque(maxlen=window_size)
 
-    def add_ai_message(self, message: str):
-        self.messages.append({"role": "assistant", "content": message})
-        self._trim()
+    def add_exchange(self, user_message: str, ai_message: str):
+        self.exchanges.append((user_message, ai_message))
 
     def clear(self):
-        self.messages = []
-
-    def _trim(self):
-        max_messages = self.window_size * 2
-        if len(self.messages) > max_messages:
-            self.messages = self.messages[-max_messages:]
+        self.exchanges.clear()
 
 class SimpleLabLLM:
     """Small OpenAI-compatible wrapper for the lab-provided LLM."""
 
+    SYSTEM_PROMPT = "You are BarryBot, a helpful assistant with access to a user database. "
+    DEFAULT_SYSTEM_PROMPT = SYSTEM_PROMPT + "If asked about users, let the user know you'll search the database for them."
+
     def __init__(self, api_key: str = None, base_url: str = None, model: str = None):
         self.api_key = api_key or self._load_api_key()
         self.base_url = (base_url or self._load_base_url()).rstrip("/")
         self.model = model or get_lab_llm_model()
         self.api_url = f"{self.base_url}/chat/completions"
 
+        # Everything except the user turn is fixed per instance, so build it once.
+        # Keeping the system message byte-identical also lets servers with
+        # automatic prompt-prefix caching reuse it across calls.
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self._default_system_message = {"role": "system", "content": self.DEFAULT_SYSTEM_PROMPT}
+
     def _load_api_key(self) -> str:
         key = get_lab_llm_api_key()
         if key:
@@ -59,32 +75,31 @@ class SimpleLabLLM:
 
     def __call__(self, prompt: str, database_context: str = "", **kwargs) -> str:
         """Call the lab LLM with optional database context."""
+        import requests
+
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            system_prompt = "You are BarryBot, a helpful assistant with access to a user database. "
             if database_context:
-                system_prompt += f"Here is the relevant data from the database:\n{database_context}\n\nUse this information to answer the user's question accurately."
+                system_message = {
+                    "role": "system",
+                    "content": f"{self.SYSTEM_PROMPT}Here is the relevant data from the database:\n{database_context}\n\nUse this information to answer the user's question accurately."
+                }
             else:
-                system_prompt += "If asked about users, let the user know you'll search the database for them."
+                system_message = self._default_system_message
             
             data = {
                 "model": self.model,
                 "messages": [
-                    {"role": "system", "content": system_prompt},
+                    system_message,
                     {"role": "user", "content": prompt}
                 ],
                 "max_tokens": 150,
                 "temperature": 0.7
             }
 
-            response = requests.post(self.api_url, headers=headers, json=data, timeout=30)
+            response = get_http_session().post(self.api_url, headers=self._headers, data=dumps_json(data), timeout=30)
             response.raise_for_status()
 
-            return response.json()["choices"][0]["message"]["content"].strip()
+            return loads_json(response.content)["choices"][0]["message"]["content"].strip()
 
         except requests.exceptions.RequestException as e:
             if "429" in str(e) or "Too Many Requests" in str(e):
@@ -97,6 +112,8 @@ class SimpleLabLLM:
 class AIDefenseClient:
     """AI Defense API client for safety inspection"""
     
+    REQUEST_TIMEOUT = 30
+    
     def __init__(self):
         self.api_url = "https://us.api.inspect.aidefense.security.cisco.com/api/v1/inspect/chat"
         self.api_key = self._load_api_key()
@@ -126,9 +143,9 @@ class AIDefenseClient:
         }
         
         try:
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
+            response = get_http_session().post(self.api_url, headers=headers, data=dumps_json(payload), timeout=self.REQUEST_TIMEOUT)
             response.raise_for_status()
-            return response.json()
+            return loads_json(response.content)
         except Exception as e:
             return {"error": f"AI Defense inspection failed: {str(e)}"}
     
@@ -150,9 +167,9 @@ class AIDefenseClient:
         }
         
         try:
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
+            response = get_http_session().post(self.api_url, headers=headers, data=dumps_json(payload), timeout=self.REQUEST_TIMEOUT)
             response.raise_for_status()
-            return response.json()
+            return loads_json(response.content)
         except Exception as e:
             return {"error": f"AI Defense inspection failed: {str(e)}"}
 
@@ -215,8 +232,10 @@ class BarryBotAgent:
 
         if self.use_ai_defense:
             self.ai_defense = AIDefenseClient()
+            self._inspection_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="aidefense")
         else:
             self.ai_defense = None
+            self._inspection_executor = None
         
         # Store database connection for queries
         self.db_connection = sqlite3.connect("users.db", check_same_thread=False)
@@ -225,6 +244,8 @@ class BarryBotAgent:
         """Clean up database connection"""
         if hasattr(self, 'db_connection'):
             self.db_connection.close()
+        if getattr(self, '_inspection_executor', None):
+            self._inspection_executor.shutdown(wait=False)
     
     def query_database(self, user_input: str) -> str:
         """Query database based on user input and return formatted results"""
@@ -319,8 +340,7 @@ class BarryBotAgent:
         if database_context:
             return database_context
 
-        message_lower = message.lower()
-        if "joke" in message_lower:
+        if not _JOKE_WORDS.isdisjoint(_WORD_PATTERN.findall(message.casefold())):
             return "Why do programmers mix up Halloween and Christmas? Because OCT 31 == DEC 25."
 
         return "I couldn't reach the lab LLM right now, but the AI Defense checks still ran."
@@ -360,36 +380,21 @@ class BarryBotAgent:
                 response = self.local_fallback(message, database_context=database_context)
             
             # Add to memory
-            self.memory.add_user_message(message)
-            self.memory.add_ai_message(response)
+            self.memory.add_exchange(message, response)
             
             # Check with AI Defense if enabled
             if self.use_ai_defense and self.ai_defense:
+                if self.security_action == 'log':
+                    # LOG mode never changes the response, so the verdict can arrive after it is shown
+                    safety_future = self._inspection_executor.submit(self.ai_defense.inspect_conversation, message, response)
+                    return {
+                        "response": response,
+                        "ai_defense_enabled": True,
+                        "safety_future": safety_future
+                    }
+
                 safety_result = self.ai_defense.inspect_conversation(message, response)
-                is_safe = safety_result.get("is_safe", True) if "error" not in safety_result else True
-                classifications = safety_result.get('classifications', [])
-                
-                # Apply security action based on mode
-                original_response = response
-                if not is_safe:
-                    if self.security_action == 'block':
-                        # BLOCK: Replace unsafe response completely
-                        response = "🚫 I cannot provide this information for security reasons."
-                    elif self.security_action == 'warn':
-                        # WARN: Keep response but add warning
-                        response = f"⚠️  Security Warning: This response may contain sensitive information.\n\n{response}"
-                    # LOG mode: Keep original response, just log it
-                
-                safety_info = "Safe" if is_safe else f"⚠️  Safety concern: {classifications}"
-                
-                return {
-                    "response": response,
-                    "ai_defense_enabled": True,
-                    "is_safe": is_safe,
-                    "safety_info": safety_info,
-                    "classifications": classifications,
-                    "security_action": self.security_action if not is_safe else None
-                }
+                return self._apply_safety_result(response, safety_result)
             else:
                 return {
                     "response": response,
@@ -406,6 +411,68 @@ class BarryBotAgent:
                 "safety_info": f"Error: {str(e)}"
             }
     
+    def _apply_safety_result(self, response: str, safety_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the configured security action to a response based on the AI Defense verdict"""
+        is_safe = safety_result.get("is_safe", True) if "error" not in safety_result else True
+        classifications = safety_result.get('classifications', [])
+        
+        # Apply security action based on mode
+        if not is_safe:
+            if self.security_action == 'block':
+                # BLOCK: Replace unsafe response completely
+                response = "🚫 I cannot provide this information for security reasons."
+            elif self.security_action == 'warn':
+                # WARN: Keep response but add warning
+                response = f"⚠️  Security Warning: This response may contain sensitive information.\n\n{response}"
+            # LOG mode: Keep original response, just log it
+        
+        safety_info = "Safe" if is_safe else f"⚠️  Safety concern: {classifications}"
+        
+        return {
+            "response": response,
+            "ai_defense_enabled": True,
+            "is_safe": is_safe,
+            "safety_info": safety_info,
+            "classifications": classifications,
+            "security_action": self.security_action if not is_safe else None
+        }
+    
+    def resolve_safety(self, result: Dict[str, Any], timeout: float = 2.0) -> Dict[str, Any]:
+        """Wait for a pending AI Defense verdict and merge it into the chat result"""
+        safety_future = result.pop("safety_future", None)
+        if safety_future is None:
+            return result
+        
+        try:
+            safety_result = safety_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Still unknown, so not reported as safe; the verdict is printed when it lands
+            safety_future.add_done_callback(
+                functools.partial(self._report_late_verdict, result["response"])
+            )
+            result.update({
+                "is_safe": None,
+                "safety_info": "Verdict pending - it will be reported when AI Defense responds",
+                "classifications": [],
+                "security_action": None
+            })
+            return result
+        
+        result.update(self._apply_safety_result(result["response"], safety_result))
+        return result
+    
+    def _report_late_verdict(self, response: str, safety_future):
+        """Print an AI Defense verdict that arrived after its response was shown"""
+        verdict = self._apply_safety_result(response, safety_future.result())
+        if verdict["is_safe"]:
+            lines = ["🛡️  AI Defense (late verdict): Response verified safe"]
+        else:
+            lines = [f"🛡️  AI Defense (late verdict): {verdict['safety_info']}"]
+            if verdict.get("security_action"):
+                lines.append(f"    Action: {_ACTION_MESSAGES.get(verdict['security_action'], 'Unknown')}")
+        sys.stdout.write("\n" + "\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
     def run_interactive(self):
         """Run interactive chat session"""
         print("🤖 BarryBot AI Agent")
@@ -464,18 +531,14 @@ class BarryBotAgent:
                     print(f"\nBarryBot: {result['response']}")
                 
                 # Display safety info only if AI Defense is enabled
+                result = self.resolve_safety(result)
                 if result['ai_defense_enabled']:
                     if result['is_safe']:
                         print("🛡️  AI Defense: Response verified safe")
                     else:
                         print(f"🛡️  AI Defense: {result['safety_info']}")
                         if result.get('security_action'):
-                            action_msgs = {
-                                'block': '🚫 Response BLOCKED by security policy',
-                                'warn': '⚠️  Response ALLOWED with warning',
-                                'log': '📝 Response LOGGED for audit'
-                            }
-                            print(f"    Action: {action_msgs.get(result['security_action'], 'Unknown')}")
+                            print(f"    Action: {_ACTION_MESSAGES.get(result['security_action'], 'Unknown')}")
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Goodbye!")
@@ -575,16 +638,12 @@ Contact: bayuan@cisco.com for questions and issues
         else:
             print(f"BarryBot: {result['response']}")
         
-        # Display security info
+        # Display security info; the process exits next, so wait as long as the request may take
+        result = agent.resolve_safety(result, timeout=AIDefenseClient.REQUEST_TIMEOUT)
         if result['ai_defense_enabled'] and not result['is_safe']:
             print(f"\n🛡️  AI Defense: {result['safety_info']}")
             if result.get('security_action'):
-                action_msgs = {
-                    'block': '🚫 Response BLOCKED by security policy',
-                    'warn': '⚠️  Response ALLOWED with warning',
-                    'log': '📝 Response LOGGED for audit'
-                }
-                print(f"    Action: {action_msgs.get(result['security_action'], 'Unknown')}")
+                print(f"    Action: {_ACTION_MESSAGES.get(result['security_action'], 'Unknown')}")
         print()
     else:
         # Interactive mode
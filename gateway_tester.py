@@ -12,12 +12,14 @@ warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', message='.*urllib3.*')
 
 import requests
+import re
 import json
 import time
 import sys
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import argparse
+from http_pool import get_http_session
 from session_cache import (
     get_gateway_connection_id,
     get_gateway_auth_token,
@@ -30,6 +32,12 @@ from session_cache import (
 import urllib3
 urllib3.disable_warnings()
 
+# Markdown cleanup patterns for terminal display, compiled once
+_MD_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_MD_ITALIC = re.compile(r'(?<!\*)\*(?!\*)([^*]+?)(?<!\*)\*(?!\*)')
+_MD_CODE = re.compile(r'`([^`]+)`')
+_MD_HEADER = re.compile(r'#{1,6}\s*')
+
 class AIDefenseGatewayTester:
     """Interactive CLI tool for testing AI Defense Gateway"""
     
@@ -164,7 +172,7 @@ class AIDefenseGatewayTester:
         start_time = time.time()
 
         try:
-            response = requests.post(
+            response = get_http_session().post(
                 self.gateway_url,
                 headers=headers,
                 data=payload_json,
@@ -328,17 +336,15 @@ class AIDefenseGatewayTester:
     
     def _clean_markdown(self, text: str) -> str:
         """Clean up common Markdown formatting for terminal display"""
-        import re
-        
         # Remove bold formatting **text** -> text
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+        text = _MD_BOLD.sub(r'\1', text)
         
         # Remove italic formatting *text* -> text (but be careful not to affect ** patterns)
-        text = re.sub(r'(?<!\*)\*(?!\*)([^*]+?)(?<!\*)\*(?!\*)', r'\1', text)
+        text = _MD_ITALIC.sub(r'\1', text)
         
         # Clean up common Markdown patterns
-        text = re.sub(r'`([^`]+)`', r'\1', text)  # Remove code backticks
-        text = re.sub(r'#{1,6}\s*', '', text)     # Remove headers
+        text = _MD_CODE.sub(r'\1', text)  # Remove code backticks
+        text = _MD_HEADER.sub('', text)    # Remove headers
         
         return text.strip()
 
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP connection pool for the AI Defense lab.
+Keeps a single keep-alive session per process so the lab LLM, AI Defense
+and gateway calls reuse warm TLS connections instead of reconnecting.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+_session = None
+
+
+def _build_session():
+    # Imported here so scripts only pay for requests once they make a call
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # Every caller POSTs, which urllib3 does not retry after a response or a
+    # read error, so in practice only failed connects are retried
+    retries = Retry(total=2, backoff_factor=0.2)
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=False,
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session():
+    global _session
+    if _session is None:
+        _session = _build_session()
+    return _session
+
+
+def dumps_json(obj) -> bytes:
+    """Serialize a request body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(data: bytes):
+    """Parse a response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -6,6 +6,7 @@ Lists all AI applications and connections in your AI Defense tenant
 import os
 import sys
 import json
+from aidefense_common import format_enum
 from session_cache import get_mgmt_api
 
 
@@ -26,12 +27,6 @@ def load_lab_resources():
     return {}
 
 
-def connection_type_label(value):
-    if hasattr(value, "value"):
-        return value.value
-    return str(value)
-
-
 def api_key_counts(client, connection_id):
     try:
         raw_keys = client.connections.make_request("GET", f"connections/{connection_id}/keys")
@@ -90,7 +85,7 @@ def main():
                 for app in apps_resp.applications.items:
                     name_lower = app.application_name.lower()
                     desc_lower = (app.description or "").lower()
-                    conn_type = connection_type_label(app.connection_type).lower()
+                    conn_type = format_enum(app.connection_type).lower()
                     
                     # Categorize based on name and description
                     if "gateway" in conn_type or any(keyword in name_lower + desc_lower for keyword in ['gateway', 'gpt', 'claude', 'llm', 'model']):
@@ -110,7 +105,7 @@ def main():
                         print(f"   {i}. {app.application_name}{lab_marker}")
                         if app.description:
                             print(f"      Description: {app.description}")
-                        print(f"      Integration: {connection_type_label(app.connection_type)}")
+                        print(f"      Integration: {format_enum(app.connection_type)}")
                 
                 if protected_services:
                     print("\n🧠 Protected Model Services:")
@@ -119,7 +114,7 @@ def main():
                         print(f"   {i}. {app.application_name}{lab_marker}")
                         if app.description:
                             print(f"      Description: {app.description}")
-                        print(f"      Integration: {connection_type_label(app.connection_type)}")
+                        print(f"      Integration: {format_enum(app.connection_type)}")
                 
                 # Display Knowledge Bases
                 if knowledge_bases:
@@ -129,7 +124,7 @@ def main():
                         print(f"   {i}. {app.application_name}{lab_marker}")
                         if app.description:
                             print(f"      Description: {app.description}")
-                        print(f"      Integration: {connection_type_label(app.connection_type)}")
+                        print(f"      Integration: {format_enum(app.connection_type)}")
                 
                 # Display Other Assets
                 if other:
@@ -139,7 +134,7 @@ def main():
                         print(f"   {i}. {app.application_name}{lab_marker}")
                         if app.description:
                             print(f"      Description: {app.description}")
-                        print(f"      Integration: {connection_type_label(app.connection_type)}")
+                        print(f"      Integration: {format_enum(app.connection_type)}")
                 
                 print(f"\n   Total AI Assets: {apps_resp.applications.paging.total}")
             else:
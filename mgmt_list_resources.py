@@ -6,6 +6,7 @@ Lists all applications, connections, and policies in your AI Defense tenant
 import os
 import sys
 import json
+from aidefense_common import format_enum
 from session_cache import get_mgmt_api
 
 
@@ -26,12 +27,6 @@ def load_lab_resources():
     return {}
 
 
-def connection_type_label(value):
-    if hasattr(value, "value"):
-        return value.value
-    return str(value)
-
-
 def api_key_counts(client, connection_id):
     try:
         raw_keys = client.connections.make_request("GET", f"connections/{connection_id}/keys")
@@ -90,7 +85,7 @@ def main():
                         print(f"   Description: {app.description}")
                     # Handle connection_type which might be enum or string
                     if hasattr(app, 'connection_type') and app.connection_type:
-                        print(f"   Connection Type: {connection_type_label(app.connection_type)}")
+                        print(f"   Connection Type: {format_enum(app.connection_type)}")
                     if hasattr(app, 'created_at') and app.created_at:
                         print(f"   Created: {app.created_at}")
                 
@@ -5,6 +5,7 @@ Scans a local model file for security threats
 """
 import os
 import sys
+from aidefense_common import format_enum
 from session_cache import get_mgmt_api
 
 
@@ -49,7 +50,7 @@ def print_threats(techniques, indent=0):
                 print(f"{indent_str}  │  └─ Detections:")
                 for threat in sub_technique.items:
                     # Handle threat_type - can be enum or string
-                    threat_type = threat.threat_type.value if hasattr(threat.threat_type, 'value') else str(threat.threat_type)
+                    threat_type = format_enum(threat.threat_type)
                     print(f"{indent_str}  │     • {threat_type}")
                     if threat.details:
                         print(f"{indent_str}  │       Details: {threat.details}")
@@ -105,7 +106,7 @@ def main():
         print(f"🔑 Scan ID: {result.scan_id}")
         
         # Handle status - can be enum or string
-        status_str = result.status.value if hasattr(result.status, 'value') else str(result.status)
+        status_str = format_enum(result.status)
         print(f"📊 Status: {status_str}")
         print(f"📅 Created: {result.created_at}")
         
@@ -134,7 +135,7 @@ def main():
                 print(f"\n{status_icon} {item.name} ({item.size} bytes)")
                 
                 # Handle status - can be enum or string
-                item_status = item.status.value if hasattr(item.status, 'value') else str(item.status)
+                item_status = format_enum(item.status)
                 print(f"  Status: {item_status}")
                 
                 if item.reason:
@@ -154,7 +155,7 @@ def main():
             print("❌ Scan failed")
         else:
             # Handle status - can be enum or string
-            status_str = result.status.value if hasattr(result.status, 'value') else str(result.status)
+            status_str = format_enum(result.status)
             print(f"ℹ️  Scan status: {status_str}")
             
     except Exception as e:
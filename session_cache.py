@@ -6,9 +6,20 @@ Reads and decrypts the session token from .aidefense/.cache.
 from typing import Optional, List, Dict
 import os
 import base64
+import binascii
 
 CACHE_FILE = ".aidefense/.cache"
 
+# Read once per process; an empty DEVENV_USER falls back like
+# ${DEVENV_USER:-...} does in 0-init-lab.sh
+_ENV_KEY = (os.environ.get("DEVENV_USER") or "default-key-fallback").encode()
+# Repeated-key integers by token length
+_key_ints: Dict[int, int] = {}
+
+# Decoded session parts, reused until the cache file changes
+_session_parts: Optional[List[str]] = None
+_session_parts_stamp = None
+
 FIELD_POSITIONS: Dict[str, int] = {
     "primary": 0,
     "legacy_llm": 1,
@@ -18,38 +29,64 @@ FIELD_POSITIONS: Dict[str, int] = {
 }
 
 
-def _get_session_token() -> Optional[str]:
-    if not os.path.exists(CACHE_FILE):
-        return None
+def _get_session_token() -> Optional[bytes]:
+    # A missing file surfaces as OSError from open(); no separate exists() stat
     try:
-        with open(CACHE_FILE, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("session_token="):
-                    return line.split("=", 1)[1].strip()
-    except Exception:
+        with open(CACHE_FILE, "rb") as f:
+            data = f.read()
+        # Leading newline so a token on the first line is found too
+        _, found, rest = (b"\n" + data).partition(b"\nsession_token=")
+        if found:
+            return rest.split(b"\n", 1)[0].strip()
+    except OSError:
         pass
     return None
 
 
-def _decode_session_token(token: str) -> Optional[str]:
+def _repeated_key(n: int) -> bytes:
+    return (_ENV_KEY * (n // len(_ENV_KEY) + 1))[:n]
+
+
+def _xor_with_key(data: bytes) -> bytes:
+    n = len(data)
+    # One big-int XOR instead of a Python-level loop over every byte
+    key_int = _key_ints.get(n)
+    if key_int is None:
+        key_int = _key_ints[n] = int.from_bytes(_repeated_key(n), "big")
+    return (int.from_bytes(data, "big") ^ key_int).to_bytes(n, "big")
+
+
+def _decode_session_token(token: bytes) -> Optional[str]:
     try:
-        env_key = os.environ.get("DEVENV_USER", "default-key-fallback")
         data = base64.b64decode(token)
-        key_rep = (env_key * (len(data) // len(env_key) + 1))[:len(data)]
-        return bytes(a ^ b for a, b in zip(data, key_rep.encode())).decode("utf-8")
-    except Exception:
+    except binascii.Error:
+        return None
+    plain = _xor_with_key(data)
+    # Keys are ASCII in practice; fall back for anything else
+    try:
+        return plain.decode("ascii")
+    except UnicodeDecodeError:
+        pass
+    try:
+        return plain.decode("utf-8")
+    except UnicodeDecodeError:
+        # Written with a different DEVENV_USER
         return None
 
 
 def load_session_parts() -> Optional[List[str]]:
-    token = _get_session_token()
-    if not token:
-        return None
-    plaintext = _decode_session_token(token)
-    if not plaintext:
+    global _session_parts, _session_parts_stamp
+    try:
+        st = os.stat(CACHE_FILE)
+    except OSError:
         return None
-    return plaintext.split(":")
+    stamp = (st.st_mtime_ns, st.st_size)
+    if stamp != _session_parts_stamp:
+        token = _get_session_token()
+        plaintext = _decode_session_token(token) if token else None
+        _session_parts = plaintext.split(":") if plaintext else None
+        _session_parts_stamp = stamp
+    return list(_session_parts) if _session_parts else None
 
 
 def get_cached_value(field_name: str) -> Optional[str]: